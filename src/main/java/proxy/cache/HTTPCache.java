@@ -135,6 +135,20 @@ public class HTTPCache {
         }
     }
     
+    /**
+     * Thread-safe check for a cached entry without counting a hit or miss
+     * or touching the LRU order. Used for logging the cache status of a
+     * request whose real lookup happens later.
+     */
+    public boolean contains(String cacheKey) {
+        lock.readLock().lock();
+        try {
+            return cache.containsKey(cacheKey);
+        } finally {
+            lock.readLock().unlock();
+        }
+    }
+
     /**
      * Thread-safe add response to cache with LRU eviction.
      */
@@ -203,13 +217,15 @@ public class HTTPCache {
     }
     
     /**
-     * Thread-safe clear all cache entries.
+     * Thread-safe clear all cache entries and statistics.
      */
     public void clear() {
         lock.writeLock().lock();
         try {
             cache.clear();
             currentSize = 0;
+            hitCount = 0;
+            missCount = 0;
         } finally {
             lock.writeLock().unlock();
         }
@@ -13,7 +13,9 @@ public class HTTPMessageBuilder {
      */
     public static byte[] buildRequest(String method, String target, String version, 
                                     Map<String, String> headers, byte[] body) {
-        StringBuilder message = new StringBuilder();
+        // Presize for the request line plus a typical ~32 bytes per header
+        StringBuilder message = new StringBuilder(
+            64 + (headers != null ? headers.size() * 32 : 0));
         message.append(method).append(" ").append(target).append(" ").append(version).append("\r\n");
         
         if (headers != null) {
@@ -41,7 +43,9 @@ public class HTTPMessageBuilder {
      */
     public static byte[] buildResponse(String version, int statusCode, String reasonPhrase,
                                      Map<String, String> headers, byte[] body) {
-        StringBuilder message = new StringBuilder();
+        // Presize for the status line plus a typical ~32 bytes per header
+        StringBuilder message = new StringBuilder(
+            64 + (headers != null ? headers.size() * 32 : 0));
         message.append(version).append(" ").append(statusCode).append(" ").append(reasonPhrase).append("\r\n");
         
         if (headers != null) {
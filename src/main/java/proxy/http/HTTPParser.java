@@ -1,14 +1,9 @@
 package proxy.http;
 
-import java.util.regex.Pattern;
-
 /**
  * HTTP message parser for requests and responses.
  */
 public class HTTPParser {
-    private static final Pattern METHOD_PATTERN = Pattern.compile("^[A-Z]+$");
-    private static final Pattern VERSION_PATTERN = Pattern.compile("^HTTP/\\d+\\.\\d+$");
-    private static final Pattern HEADER_NAME_PATTERN = Pattern.compile("^[!#$%&'*+\\-.0-9A-Z^_`a-z|~]+$");
     
     /**
      * Parse HTTP request line into method, target, version.
@@ -24,12 +19,12 @@ public class HTTPParser {
         String version = parts[2];
         
         // Validate method
-        if (!METHOD_PATTERN.matcher(method).matches()) {
+        if (!isValidMethod(method)) {
             throw new HTTPParseException("Invalid method: " + method);
         }
         
         // Validate version
-        if (!VERSION_PATTERN.matcher(version).matches()) {
+        if (!isValidVersion(version)) {
             throw new HTTPParseException("Invalid HTTP version: " + version);
         }
         
@@ -56,7 +51,7 @@ public class HTTPParser {
         String reasonPhrase = parts.length > 2 ? parts[2] : "";
         
         // Validate version
-        if (!VERSION_PATTERN.matcher(version).matches()) {
+        if (!isValidVersion(version)) {
             throw new HTTPParseException("Invalid HTTP version: " + version);
         }
         
@@ -85,13 +80,83 @@ public class HTTPParser {
         }
         
         // Validate header name (RFC 7230)
-        if (!HEADER_NAME_PATTERN.matcher(name).matches()) {
+        if (!isValidHeaderName(name)) {
             throw new HTTPParseException("Invalid header name: " + name);
         }
         
         return new String[]{name, value};
     }
     
+    /**
+     * Equivalent of ^[A-Z]+$ without allocating a Matcher per request line.
+     */
+    private static boolean isValidMethod(String method) {
+        if (method.isEmpty()) {
+            return false;
+        }
+        for (int i = 0; i < method.length(); i++) {
+            char c = method.charAt(i);
+            if (c < 'A' || c > 'Z') {
+                return false;
+            }
+        }
+        return true;
+    }
+    
+    /**
+     * Equivalent of ^HTTP/\d+\.\d+$ without allocating a Matcher.
+     */
+    private static boolean isValidVersion(String version) {
+        if (!version.startsWith("HTTP/")) {
+            return false;
+        }
+        int i = 5;
+        int length = version.length();
+        int majorStart = i;
+        while (i < length && version.charAt(i) >= '0' && version.charAt(i) <= '9') {
+            i++;
+        }
+        if (i == majorStart || i >= length || version.charAt(i) != '.') {
+            return false;
+        }
+        i++;
+        int minorStart = i;
+        while (i < length && version.charAt(i) >= '0' && version.charAt(i) <= '9') {
+            i++;
+        }
+        return i > minorStart && i == length;
+    }
+    
+    /**
+     * RFC 7230 token check, run once per header line; equivalent of the
+     * ^[!#$%&'*+\-.0-9A-Z^_`a-z|~]+$ pattern.
+     */
+    private static boolean isValidHeaderName(String name) {
+        if (name.isEmpty()) {
+            return false;
+        }
+        for (int i = 0; i < name.length(); i++) {
+            if (!isTokenChar(name.charAt(i))) {
+                return false;
+            }
+        }
+        return true;
+    }
+    
+    private static boolean isTokenChar(char c) {
+        if ((c >= '0' && c <= '9') || (c >= 'A' && c <= 'Z') || (c >= 'a' && c <= 'z')) {
+            return true;
+        }
+        switch (c) {
+            case '!': case '#': case '$': case '%': case '&': case '\'':
+            case '*': case '+': case '-': case '.': case '^': case '_':
+            case '`': case '|': case '~':
+                return true;
+            default:
+                return false;
+        }
+    }
+    
     /**
      * Parse HTTP request from raw data.
      */
@@ -99,51 +164,28 @@ public class HTTPParser {
         if (data == null || data.isEmpty()) {
             throw new HTTPParseException("Empty request");
         }
-        
-        // Split into lines
-        String[] lines = data.replace("\r\n", "\n").replace("\r", "\n").split("\n");
-        
-        if (lines.length == 0) {
-            throw new HTTPParseException("Empty request");
-        }
-        
+
         HTTPRequest request = new HTTPRequest();
-        
+
         // Parse request line
-        String[] requestParts = parseRequestLine(lines[0]);
+        int lineEnd = findLineEnd(data, 0);
+        String[] requestParts = parseRequestLine(data.substring(0, lineEnd));
         request.setMethod(requestParts[0]);
         request.setTarget(requestParts[1]);
         request.setVersion(requestParts[2]);
-        
-        // Find end of headers (empty line)
-        int headerEnd = 1;
-        while (headerEnd < lines.length && !lines[headerEnd].trim().isEmpty()) {
-            headerEnd++;
-        }
-        
-        // Parse headers
-        if (headerEnd > 1) {
-            for (int i = 1; i < headerEnd; i++) {
-                String[] headerParts = parseHeaderLine(lines[i]);
-                request.setHeader(headerParts[0], headerParts[1]);
-            }
-        }
-        
-        // Parse body if present (body comes after empty line)
-        if (headerEnd < lines.length - 1) {
-            StringBuilder bodyBuilder = new StringBuilder();
-            for (int i = headerEnd + 1; i < lines.length; i++) {
-                if (i > headerEnd + 1) {
-                    bodyBuilder.append("\n");
-                }
-                bodyBuilder.append(lines[i]);
-            }
-            request.setBody(bodyBuilder.toString().getBytes());
+
+        // Walk the header lines in place; no intermediate lines array
+        int bodyStart = parseHeaderLines(data, nextLineStart(data, lineEnd), request::setHeader);
+
+        // Parse body if present (body comes after empty line); the body is
+        // the raw remainder, taken as one slice
+        if (bodyStart != -1 && bodyStart < data.length()) {
+            request.setBody(data.substring(bodyStart).getBytes());
         }
-        
+
         return request;
     }
-    
+
     /**
      * Parse HTTP response from raw data.
      */
@@ -151,48 +193,88 @@ public class HTTPParser {
         if (data == null || data.isEmpty()) {
             throw new HTTPParseException("Empty response");
         }
-        
-        // Split into lines
-        String[] lines = data.replace("\r\n", "\n").replace("\r", "\n").split("\n");
-        
-        if (lines.length == 0) {
-            throw new HTTPParseException("Empty response");
-        }
-        
+
         HTTPResponse response = new HTTPResponse();
-        
+
         // Parse status line
-        Object[] statusParts = parseStatusLine(lines[0]);
+        int lineEnd = findLineEnd(data, 0);
+        Object[] statusParts = parseStatusLine(data.substring(0, lineEnd));
         response.setVersion((String) statusParts[0]);
         response.setStatusCode((Integer) statusParts[1]);
         response.setReasonPhrase((String) statusParts[2]);
-        
-        // Find end of headers (empty line)
-        int headerEnd = 1;
-        while (headerEnd < lines.length && !lines[headerEnd].trim().isEmpty()) {
-            headerEnd++;
+
+        // Walk the header lines in place; no intermediate lines array
+        int bodyStart = parseHeaderLines(data, nextLineStart(data, lineEnd), response::setHeader);
+
+        // Parse body if present; the body is the raw remainder, taken as
+        // one slice
+        if (bodyStart != -1 && bodyStart < data.length()) {
+            response.setBody(data.substring(bodyStart).getBytes());
         }
-        
-        // Parse headers
-        if (headerEnd > 1) {
-            for (int i = 1; i < headerEnd; i++) {
-                String[] headerParts = parseHeaderLine(lines[i]);
-                response.setHeader(headerParts[0], headerParts[1]);
+
+        return response;
+    }
+
+    private interface HeaderSink {
+        void accept(String name, String value);
+    }
+
+    /**
+     * Scan header lines starting at pos, feeding each parsed name/value pair
+     * to the sink. Returns the index just past the blank line that terminates
+     * the headers, or -1 if the data ends without one.
+     */
+    private static int parseHeaderLines(String data, int pos, HeaderSink sink)
+            throws HTTPParseException {
+        int length = data.length();
+        while (pos < length) {
+            int lineEnd = findLineEnd(data, pos);
+            if (isBlank(data, pos, lineEnd)) {
+                return nextLineStart(data, lineEnd);
             }
+            String[] headerParts = parseHeaderLine(data.substring(pos, lineEnd));
+            sink.accept(headerParts[0], headerParts[1]);
+            pos = nextLineStart(data, lineEnd);
         }
-        
-        // Parse body if present
-        if (headerEnd < lines.length - 1) {
-            StringBuilder bodyBuilder = new StringBuilder();
-            for (int i = headerEnd + 1; i < lines.length; i++) {
-                if (i > headerEnd + 1) {
-                    bodyBuilder.append("\n");
-                }
-                bodyBuilder.append(lines[i]);
+        return -1;
+    }
+
+    /**
+     * Index of the first line terminator (\r or \n) at or after from, or the
+     * end of the data if the last line is unterminated.
+     */
+    private static int findLineEnd(String data, int from) {
+        int length = data.length();
+        for (int i = from; i < length; i++) {
+            char c = data.charAt(i);
+            if (c == '\r' || c == '\n') {
+                return i;
             }
-            response.setBody(bodyBuilder.toString().getBytes());
         }
-        
-        return response;
+        return length;
+    }
+
+    /**
+     * Index of the first character after the terminator at lineEnd,
+     * treating \r\n as a single terminator.
+     */
+    private static int nextLineStart(String data, int lineEnd) {
+        if (lineEnd >= data.length()) {
+            return lineEnd;
+        }
+        if (data.charAt(lineEnd) == '\r' &&
+            lineEnd + 1 < data.length() && data.charAt(lineEnd + 1) == '\n') {
+            return lineEnd + 2;
+        }
+        return lineEnd + 1;
+    }
+
+    private static boolean isBlank(String data, int from, int to) {
+        for (int i = from; i < to; i++) {
+            if (!Character.isWhitespace(data.charAt(i))) {
+                return false;
+            }
+        }
+        return true;
     }
 }
\ No newline at end of file
@@ -11,9 +11,11 @@ public class HTTPRequest {
     private String method;
     private String target;
     private String version;
-    private Map<String, String> headers; // Case-insensitive headers
+    private final Map<String, String> headers; // Case-insensitive headers
     private byte[] body;
-    private Map<String, String> rawHeaders; // Original case headers for forwarding
+    private final Map<String, String> rawHeaders; // Original case headers for forwarding
+    private Integer contentLength; // Memoized Content-Length parse
+    private boolean contentLengthCached;
     
     public HTTPRequest() {
         this.headers = new HashMap<>();
@@ -34,6 +36,9 @@ public class HTTPRequest {
     public void setHeader(String name, String value) {
         headers.put(name.toLowerCase(), value);
         rawHeaders.put(name, value);
+        if ("content-length".equalsIgnoreCase(name)) {
+            contentLengthCached = false;
+        }
     }
     
     /**
@@ -48,15 +53,22 @@ public class HTTPRequest {
      * Get content length as integer, or null if not present.
      */
     public Integer getContentLength() throws HTTPParseException {
+        // Parsed once and remembered; setHeader invalidates on update
+        if (contentLengthCached) {
+            return contentLength;
+        }
         String length = getHeader("content-length");
         if (length != null) {
             try {
-                return Integer.parseInt(length);
+                contentLength = Integer.parseInt(length);
             } catch (NumberFormatException e) {
                 throw new HTTPParseException("Invalid Content-Length: " + length);
             }
+        } else {
+            contentLength = null;
         }
-        return null;
+        contentLengthCached = true;
+        return contentLength;
     }
     
     /**
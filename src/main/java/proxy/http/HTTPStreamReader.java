@@ -17,7 +17,10 @@ public class HTTPStreamReader {
     private int bufferPos;
     private int bufferLimit;
     private static final int MAX_HEADER_SIZE = 65536; // 64KB max for headers
-    private static final int BUFFER_SIZE = 4096;
+    // Large enough that a full header block is normally pulled in with a
+    // single read, and body reads (chunked and read-until-close) drain the
+    // socket 32KB per syscall instead of the 8KB stream default
+    private static final int BUFFER_SIZE = 32768;
     
     public HTTPStreamReader(Socket socket, int timeout) throws IOException {
         this.socket = socket;
@@ -64,14 +67,15 @@ public class HTTPStreamReader {
         // Parse the headers part
         HTTPResponse response = HTTPParser.parseResponse(new String(headersData, "UTF-8"));
         
-        // Read body if needed
+        // Read body if needed; look each framing header up once rather
+        // than probing for presence and then fetching the value again
+        String transferEncoding;
         if ("HEAD".equals(requestMethod)) {
             // HEAD responses never have a body
         } else if (response.getStatusCode() == 204 || response.getStatusCode() == 304) {
             // No body for these status codes
-        } else if (response.hasTransferEncoding()) {
+        } else if ((transferEncoding = response.getHeader("Transfer-Encoding")) != null) {
             // Handle transfer encoding
-            String transferEncoding = response.getHeader("Transfer-Encoding");
             if ("chunked".equalsIgnoreCase(transferEncoding)) {
                 // For simplicity, read until connection close
                 byte[] bodyData = readUntilClose();
@@ -105,32 +109,38 @@ public class HTTPStreamReader {
         ByteArrayOutputStream headerBuffer = new ByteArrayOutputStream();
         boolean foundEnd = false;
         int totalRead = 0;
-        
+        int tail = 0; // Rolling window of the last four bytes seen
+
         while (!foundEnd && totalRead < MAX_HEADER_SIZE) {
-            int b = readByte();
-            if (b == -1) {
-                break; // Connection closed
+            if (bufferPos >= bufferLimit) {
+                fillBuffer();
+                if (bufferLimit == 0) {
+                    break; // Connection closed
+                }
             }
-            
-            headerBuffer.write(b);
-            totalRead++;
-            
-            // Check for end of headers (\r\n\r\n or \n\n)
-            byte[] current = headerBuffer.toByteArray();
-            if (current.length >= 4) {
-                int len = current.length;
-                if ((current[len-4] == '\r' && current[len-3] == '\n' && 
-                     current[len-2] == '\r' && current[len-1] == '\n') ||
-                    (current[len-2] == '\n' && current[len-1] == '\n')) {
+
+            // Scan the buffered chunk for the end of headers (\r\n\r\n or \n\n)
+            int start = bufferPos;
+            while (bufferPos < bufferLimit && totalRead < MAX_HEADER_SIZE) {
+                tail = (tail << 8) | (buffer[bufferPos++] & 0xFF);
+                totalRead++;
+
+                if (totalRead >= 4 &&
+                    (tail == 0x0D0A0D0A || (tail & 0xFFFF) == 0x0A0A)) {
                     foundEnd = true;
+                    break;
                 }
             }
+
+            // Append the consumed slice in one write; unread bytes stay
+            // buffered for the body or a subsequent pipelined message
+            headerBuffer.write(buffer, start, bufferPos - start);
         }
-        
+
         if (!foundEnd && totalRead >= MAX_HEADER_SIZE) {
             throw new HTTPParseException("Headers too large");
         }
-        
+
         return headerBuffer.toByteArray();
     }
     
@@ -140,15 +150,26 @@ public class HTTPStreamReader {
     private byte[] readExactBytes(int numBytes) throws HTTPParseException, IOException {
         byte[] data = new byte[numBytes];
         int totalRead = 0;
-        
+
+        // Drain whatever is already buffered (typically body bytes that came
+        // in with the headers)
+        if (bufferPos < bufferLimit) {
+            int toCopy = Math.min(numBytes, bufferLimit - bufferPos);
+            System.arraycopy(buffer, bufferPos, data, 0, toCopy);
+            bufferPos += toCopy;
+            totalRead = toCopy;
+        }
+
+        // Read the remainder straight into the destination, skipping the
+        // intermediate copy through the internal buffer
         while (totalRead < numBytes) {
-            int bytesRead = readBytes(data, totalRead, numBytes - totalRead);
+            int bytesRead = inputStream.read(data, totalRead, numBytes - totalRead);
             if (bytesRead == -1) {
                 throw new HTTPParseException("Expected " + numBytes + " bytes, got " + totalRead);
             }
             totalRead += bytesRead;
         }
-        
+
         return data;
     }
     
@@ -157,16 +178,26 @@ public class HTTPStreamReader {
      */
     private byte[] readUntilClose() throws IOException {
         ByteArrayOutputStream bodyBuffer = new ByteArrayOutputStream();
-        byte[] tempBuffer = new byte[BUFFER_SIZE];
-        
+
+        // Body bytes that arrived together with the headers are still in the
+        // internal buffer; hand them over before touching the stream
+        if (bufferPos < bufferLimit) {
+            bodyBuffer.write(buffer, bufferPos, bufferLimit - bufferPos);
+        }
+
+        // The internal buffer is now fully consumed, so reuse it as the
+        // scratch buffer rather than allocating a fresh one per call
+        bufferPos = 0;
+        bufferLimit = 0;
+
         // Save original timeout and set a shorter one for reading chunks
         int originalTimeout = socket.getSoTimeout();
         try {
             socket.setSoTimeout(2000); // 2 second timeout for chunked reads
-            
+
             int bytesRead;
-            while ((bytesRead = inputStream.read(tempBuffer)) != -1) {
-                bodyBuffer.write(tempBuffer, 0, bytesRead);
+            while ((bytesRead = inputStream.read(buffer)) != -1) {
+                bodyBuffer.write(buffer, 0, bytesRead);
             }
         } catch (SocketTimeoutException e) {
             // Connection timeout - return what we have
@@ -178,38 +209,6 @@ public class HTTPStreamReader {
         return bodyBuffer.toByteArray();
     }
     
-    /**
-     * Read a single byte from the stream.
-     */
-    private int readByte() throws IOException {
-        if (bufferPos >= bufferLimit) {
-            fillBuffer();
-            if (bufferLimit == 0) {
-                return -1; // EOF
-            }
-        }
-        return buffer[bufferPos++] & 0xFF;
-    }
-    
-    /**
-     * Read bytes into provided array.
-     */
-    private int readBytes(byte[] dest, int offset, int length) throws IOException {
-        if (bufferPos >= bufferLimit) {
-            fillBuffer();
-            if (bufferLimit == 0) {
-                return -1; // EOF
-            }
-        }
-        
-        int available = bufferLimit - bufferPos;
-        int toRead = Math.min(length, available);
-        System.arraycopy(buffer, bufferPos, dest, offset, toRead);
-        bufferPos += toRead;
-        
-        return toRead;
-    }
-    
     /**
      * Fill internal buffer from input stream.
      */
@@ -9,6 +9,11 @@ import java.util.Locale;
  * Thread-safe logger for HTTP proxy following Common Log Format variant.
  */
 public class ProxyLogger {
+    // Timestamp format: [dd/MMM/yyyy:HH:mm:ss Z]. DateTimeFormatter is
+    // immutable and thread-safe, so build it once rather than per transaction
+    private static final DateTimeFormatter TIMESTAMP_FORMAT =
+        DateTimeFormatter.ofPattern("dd/MMM/yyyy:HH:mm:ss Z", Locale.ENGLISH);
+
     private final PrintStream outputStream;
     private final Object lock = new Object();
     
@@ -32,16 +37,13 @@ public class ProxyLogger {
             cacheStatus = "-";
         }
         
+        // Format outside the lock so concurrent workers only serialize on the
+        // actual write, not on timestamp formatting
+        String timestamp = "[" + ZonedDateTime.now().format(TIMESTAMP_FORMAT) + "]";
+        String logEntry = String.format("%s %d %s %s \"%s\" %d %d",
+            clientIp, clientPort, cacheStatus, timestamp, requestLine, statusCode, responseBytes);
+
         synchronized (lock) {
-            // Format timestamp as specified: [dd/MMM/yyyy:HH:mm:ss Z]
-            DateTimeFormatter formatter = DateTimeFormatter.ofPattern("dd/MMM/yyyy:HH:mm:ss Z", Locale.ENGLISH);
-            String timestamp = "[" + ZonedDateTime.now().format(formatter) + "]";
-            
-            // Build log entry
-            String logEntry = String.format("%s %d %s %s \"%s\" %d %d",
-                clientIp, clientPort, cacheStatus, timestamp, requestLine, statusCode, responseBytes);
-            
-            // Write to output stream
             outputStream.println(logEntry);
             outputStream.flush();
         }
@@ -3,12 +3,14 @@ package proxy.server;
 import proxy.config.ProxyConfig;
 import proxy.cache.HTTPCache;
 import proxy.http.*;
+import proxy.logging.ProxyLogger;
 import proxy.utils.*;
 
 import java.io.IOException;
 import java.io.InputStream;
 import java.io.OutputStream;
 import java.net.Socket;
+import java.util.concurrent.CountDownLatch;
 import java.util.concurrent.ExecutorService;
 import java.util.concurrent.Executors;
 import java.util.concurrent.TimeUnit;
@@ -21,15 +23,25 @@ import java.util.concurrent.ExecutionException;
  * Concurrent HTTP proxy server with threading support and caching.
  */
 public class ConcurrentProxyServer extends ProxyServer {
+    // Fixed CONNECT reply, encoded once instead of per tunnel
+    private static final byte[] CONNECTION_ESTABLISHED =
+        "HTTP/1.1 200 Connection Established\r\n\r\n".getBytes();
+
     private final int maxWorkers;
     private ExecutorService threadPool;
+    private ExecutorService requestExecutor;
+    private ExecutorService relayExecutor;
     private final HTTPCache cache;
     private final AtomicInteger totalConnections;
     private final AtomicInteger activeConnections;
     private final AtomicInteger completedConnections;
     
     public ConcurrentProxyServer(ProxyConfig config, int maxWorkers) {
-        super(config);
+        this(config, maxWorkers, new ProxyLogger());
+    }
+
+    public ConcurrentProxyServer(ProxyConfig config, int maxWorkers, ProxyLogger logger) {
+        super(config, logger);
         this.maxWorkers = maxWorkers;
         this.cache = new HTTPCache(config.getMaxCacheSize(), config.getMaxObjectSize());
         this.totalConnections = new AtomicInteger(0);
@@ -41,6 +53,13 @@ public class ConcurrentProxyServer extends ProxyServer {
     public void run() throws IOException {
         setupServerSocket();
         threadPool = Executors.newFixedThreadPool(maxWorkers);
+        // Shared pool for per-request timeout enforcement; threads are reused
+        // across requests instead of spinning up an executor per request
+        requestExecutor = Executors.newCachedThreadPool();
+        // Shared pool for CONNECT tunnel relays; idle relay threads are
+        // reused by later tunnels instead of building a two-thread pool
+        // per tunnel
+        relayExecutor = Executors.newCachedThreadPool();
         running = true;
         
         // Concurrent proxy server started
@@ -111,6 +130,9 @@ public class ConcurrentProxyServer extends ProxyServer {
     protected void handleClientPersistent(Socket clientSocket, String clientIp, int clientPort) {
         try {
             clientSocket.setSoTimeout(config.getTimeout() * 1000);
+            // Responses go out as complete writes, so disable Nagle to avoid
+            // delaying small responses behind ACKs (matches the origin side)
+            clientSocket.setTcpNoDelay(true);
             HTTPStreamReader reader = new HTTPStreamReader(clientSocket, config.getTimeout());
             OutputStream clientOutput = clientSocket.getOutputStream();
             
@@ -128,8 +150,7 @@ public class ConcurrentProxyServer extends ProxyServer {
                     // Process request with timeout
                     byte[] responseData = null;
                     // Use a future to enforce timeout on the entire request processing
-                    ExecutorService executor = Executors.newSingleThreadExecutor();
-                    Future<byte[]> future = executor.submit(() -> {
+                    Future<byte[]> future = requestExecutor.submit(() -> {
                         try {
                             return processRequest(request, clientSocket);
                         } catch (Exception e) {
@@ -157,11 +178,13 @@ public class ConcurrentProxyServer extends ProxyServer {
                     } catch (InterruptedException e) {
                         Thread.currentThread().interrupt();
                         responseData = ErrorResponseGenerator.badGateway("Request processing interrupted");
-                    } finally {
-                        executor.shutdownNow();
                     }
                     int statusCode = extractStatusCode(responseData);
-                    int responseBytes = extractResponseBodySize(responseData);
+                    // One header-end scan serves both the body-size count
+                    // here and the Connection: close check further down
+                    int headerEnd = responseData != null ? findHeaderEnd(responseData) : -1;
+                    int responseBytes = (responseData != null && headerEnd != -1)
+                            ? Math.max(0, responseData.length - headerEnd) : 0;
                     
                     // Send response
                     if (responseData != null) {
@@ -173,7 +196,7 @@ public class ConcurrentProxyServer extends ProxyServer {
                     logger.logTransaction(clientIp, clientPort, cacheStatus, requestLine, statusCode, responseBytes);
                     
                     // Check if connection should be closed
-                    if (shouldCloseConnection(request, responseData)) {
+                    if (shouldCloseConnection(request, responseData, headerEnd)) {
                         break;
                     }
                     
@@ -246,7 +269,7 @@ public class ConcurrentProxyServer extends ProxyServer {
         String path = urlParts[3];
         
         // Check for self-loop
-        if (URLParser.isSelfLoop(hostname, port, config.getPort())) {
+        if (URLParser.isSelfLoop(hostname, port, getBoundPort())) {
             return ErrorResponseGenerator.misdirectedRequest("Self-loop detected");
         }
         
@@ -293,7 +316,7 @@ public class ConcurrentProxyServer extends ProxyServer {
             }
             
             // Check for self-loop
-            if (URLParser.isSelfLoop(hostname, port, config.getPort())) {
+            if (URLParser.isSelfLoop(hostname, port, getBoundPort())) {
                 return ErrorResponseGenerator.misdirectedRequest("Self-loop detected");
             }
             
@@ -302,8 +325,7 @@ public class ConcurrentProxyServer extends ProxyServer {
             
             try {
                 // Send 200 Connection Established
-                String response = "HTTP/1.1 200 Connection Established\r\n\r\n";
-                clientSocket.getOutputStream().write(response.getBytes());
+                clientSocket.getOutputStream().write(CONNECTION_ESTABLISHED);
                 clientSocket.getOutputStream().flush();
                 
                 // Start bidirectional tunnel
@@ -324,35 +346,44 @@ public class ConcurrentProxyServer extends ProxyServer {
      * Relay data bidirectionally between client and target.
      */
     private void relayData(Socket clientSocket, Socket targetSocket) {
-        ExecutorService relayPool = Executors.newFixedThreadPool(2);
-        
+        CountDownLatch tunnelClosed = new CountDownLatch(1);
+
         try {
             // Client to target
-            relayPool.submit(() -> {
+            relayExecutor.submit(() -> {
                 try {
                     copyStream(clientSocket.getInputStream(), targetSocket.getOutputStream());
                 } catch (IOException e) {
                     // Connection closed
+                } finally {
+                    tunnelClosed.countDown();
                 }
             });
-            
+
             // Target to client
-            relayPool.submit(() -> {
+            relayExecutor.submit(() -> {
                 try {
                     copyStream(targetSocket.getInputStream(), clientSocket.getOutputStream());
                 } catch (IOException e) {
                     // Connection closed
+                } finally {
+                    tunnelClosed.countDown();
                 }
             });
-            
-            // Wait for either direction to close
-            relayPool.shutdown();
-            relayPool.awaitTermination(300, TimeUnit.SECONDS); // 5 minute max
-            
+
+            // Wait for either direction to close, then tear down both sockets
+            // so the opposite relay thread unblocks immediately instead of
+            // lingering until the full tunnel timeout
+            tunnelClosed.await(300, TimeUnit.SECONDS); // 5 minute max
+
         } catch (InterruptedException e) {
             Thread.currentThread().interrupt();
         } finally {
-            relayPool.shutdownNow();
+            // Closing both sockets makes the relay tasks' blocking reads fail,
+            // so they return to the shared pool rather than needing a
+            // per-tunnel shutdownNow
+            closeSocketSafely(clientSocket);
+            closeSocketSafely(targetSocket);
         }
     }
     
@@ -360,7 +391,9 @@ public class ConcurrentProxyServer extends ProxyServer {
      * Copy data from input stream to output stream.
      */
     private void copyStream(InputStream input, OutputStream output) throws IOException {
-        byte[] buffer = new byte[4096];
+        // 16KB chunks: tunnel relays are pure bulk copies (TLS records are up
+        // to 16KB), so larger reads mean fewer syscalls per tunnel
+        byte[] buffer = new byte[16384];
         int bytesRead;
         while ((bytesRead = input.read(buffer)) != -1) {
             output.write(buffer, 0, bytesRead);
@@ -376,16 +409,19 @@ public class ConcurrentProxyServer extends ProxyServer {
             return "-"; // Non-GET requests
         }
         
+        // Peek without counting: the real lookup in handleGetWithCache is the
+        // one that should register the hit or miss, otherwise every GET was
+        // counted twice
         String cacheKey = cache.normalizeUrl(request.getTarget());
-        HTTPResponse cached = cache.get(cacheKey);
-        return cached != null ? "H" : "M"; // Hit or Miss
+        return cache.contains(cacheKey) ? "H" : "M"; // Hit or Miss
     }
     
     /**
      * Check if connection should be closed based on headers.
      */
-    private boolean shouldCloseConnection(HTTPRequest request, byte[] responseData) {
-        // Check Connection header in request
+    private boolean shouldCloseConnection(HTTPRequest request, byte[] responseData, int headerEnd) {
+        // Check Connection header in request; one lookup serves both the
+        // close check and the HTTP/1.0 keep-alive check
         String connectionHeader = request.getHeader("connection");
         if ("close".equalsIgnoreCase(connectionHeader)) {
             return true;
@@ -393,18 +429,45 @@ public class ConcurrentProxyServer extends ProxyServer {
         
         // HTTP/1.0 closes by default unless keep-alive
         if ("HTTP/1.0".equals(request.getVersion())) {
-            String keepAlive = request.getHeader("connection");
-            return !"keep-alive".equalsIgnoreCase(keepAlive);
+            return !"keep-alive".equalsIgnoreCase(connectionHeader);
         }
         
         // Check response for Connection: close
         if (responseData != null) {
-            String responseStr = new String(responseData);
-            return responseStr.toLowerCase().contains("connection: close");
+            return responseRequestsClose(responseData, headerEnd);
         }
-        
+
         return false; // HTTP/1.1 keeps alive by default
     }
+
+    // Lower-case search target for the byte-level header scan below
+    private static final byte[] CONNECTION_CLOSE = "connection: close".getBytes();
+
+    /**
+     * Check the response's header region for Connection: close without
+     * decoding or lower-casing the whole response. The caller passes the
+     * header-end index it has already computed. Scanning only the headers
+     * also stops a body that happens to contain the phrase from closing the
+     * connection.
+     */
+    private boolean responseRequestsClose(byte[] responseData, int headerEnd) {
+        int limit = headerEnd != -1 ? headerEnd : responseData.length;
+
+        outer:
+        for (int i = 0; i + CONNECTION_CLOSE.length <= limit; i++) {
+            for (int j = 0; j < CONNECTION_CLOSE.length; j++) {
+                int c = responseData[i + j];
+                if (c >= 'A' && c <= 'Z') {
+                    c += 'a' - 'A';
+                }
+                if (c != CONNECTION_CLOSE[j]) {
+                    continue outer;
+                }
+            }
+            return true;
+        }
+        return false;
+    }
     
     /**
      * Get connection statistics.
@@ -452,17 +515,31 @@ public class ConcurrentProxyServer extends ProxyServer {
                 // Waiting for active connections to complete
             }
             
+            // Escalating shutdown: give in-flight connections a short grace
+            // period, then interrupt stragglers and wait briefly for them to
+            // unwind, rather than blocking shutdown for up to 30 seconds
             threadPool.shutdown();
             try {
-                if (!threadPool.awaitTermination(30, TimeUnit.SECONDS)) {
+                if (!threadPool.awaitTermination(5, TimeUnit.SECONDS)) {
                     // Forcing shutdown
                     threadPool.shutdownNow();
+                    threadPool.awaitTermination(2, TimeUnit.SECONDS);
                 }
             } catch (InterruptedException e) {
                 threadPool.shutdownNow();
                 Thread.currentThread().interrupt();
             }
         }
+
+        // Shutdown request timeout pool; any stuck request threads are interrupted
+        if (requestExecutor != null) {
+            requestExecutor.shutdownNow();
+        }
+
+        // Shutdown tunnel relay pool; interrupting unblocks any live relays
+        if (relayExecutor != null) {
+            relayExecutor.shutdownNow();
+        }
         
         // Print final statistics
         ConnectionStats connStats = getConnectionStats();
@@ -7,6 +7,7 @@ import proxy.logging.ProxyLogger;
 
 import java.io.IOException;
 import java.io.OutputStream;
+import java.net.InetSocketAddress;
 import java.net.ServerSocket;
 import java.net.Socket;
 import java.net.SocketException;
@@ -16,19 +17,35 @@ import java.net.SocketTimeoutException;
  * HTTP proxy server implementation.
  */
 public class ProxyServer {
+    // Accept-queue depth for the listen socket. The JDK default of 50 is
+    // easily overrun by connection bursts (the stress tests open 100 sockets
+    // at once), and overflow shows up as refused connections
+    protected static final int LISTEN_BACKLOG = 128;
+
     protected final ProxyConfig config;
     protected ServerSocket serverSocket;
+    // Port actually bound; differs from the configured port when the
+    // configuration asks for port 0 and the kernel assigns one
+    protected volatile int boundPort = -1;
     protected volatile boolean running;
     protected final MessageTransformer transformer;
     protected final OriginConnector connector;
     protected final ProxyLogger logger;
     
     public ProxyServer(ProxyConfig config) {
+        this(config, new ProxyLogger());
+    }
+
+    /**
+     * Create a server with an explicit logger; tests pass a discarding
+     * logger so high-volume runs are not throttled by console output.
+     */
+    public ProxyServer(ProxyConfig config, ProxyLogger logger) {
         this.config = config;
         this.running = false;
         this.transformer = new MessageTransformer();
         this.connector = new OriginConnector(config.getTimeout());
-        this.logger = new ProxyLogger();
+        this.logger = logger;
     }
     
     /**
@@ -52,11 +69,15 @@ public class ProxyServer {
      */
     protected void setupServerSocket() throws IOException {
         try {
-            serverSocket = new ServerSocket(config.getPort());
+            // SO_REUSEADDR must be set before bind to have any effect; otherwise
+            // quick restarts fail while the old socket lingers in TIME_WAIT
+            serverSocket = new ServerSocket();
             serverSocket.setReuseAddress(true);
-            
+            serverSocket.bind(new InetSocketAddress(config.getPort()), LISTEN_BACKLOG);
+            boundPort = serverSocket.getLocalPort();
+
             // Proxy server listening
-            
+
         } catch (IOException e) {
             throw new IOException("Failed to setup server socket: " + e.getMessage(), e);
         }
@@ -89,7 +110,7 @@ public class ProxyServer {
                 }
             } catch (Exception e) {
                 // Unexpected error in main loop
-                e.printStackTrace();
+                logger.logError("Unexpected error in main loop", e);
             }
         }
     }
@@ -101,10 +122,16 @@ public class ProxyServer {
         String requestLine = "";
         int statusCode = 502; // Default to Bad Gateway
         int responseBytes = 0;
+        // One output stream for the whole exchange, shared by the success
+        // and error paths below
+        OutputStream clientOutput = null;
         
         try {
             // Set socket timeout
             clientSocket.setSoTimeout(config.getTimeout() * 1000);
+            // Responses go out as complete writes, so disable Nagle to avoid
+            // delaying small responses behind ACKs (matches the origin side)
+            clientSocket.setTcpNoDelay(true);
             
             // Read and parse HTTP request
             HTTPStreamReader reader = new HTTPStreamReader(clientSocket, config.getTimeout());
@@ -132,7 +159,7 @@ public class ProxyServer {
             
             // Send response to client
             if (responseData != null) {
-                OutputStream clientOutput = clientSocket.getOutputStream();
+                clientOutput = clientSocket.getOutputStream();
                 clientOutput.write(responseData);
                 clientOutput.flush();
             }
@@ -141,7 +168,11 @@ public class ProxyServer {
             // Malformed request
             try {
                 byte[] errorResponse = ErrorResponseGenerator.badRequest("Malformed request: " + e.getMessage());
-                clientSocket.getOutputStream().write(errorResponse);
+                if (clientOutput == null) {
+                    clientOutput = clientSocket.getOutputStream();
+                }
+                clientOutput.write(errorResponse);
+                clientOutput.flush();
                 statusCode = 400;
                 responseBytes = errorResponse.length;
             } catch (IOException ioE) {
@@ -152,7 +183,11 @@ public class ProxyServer {
             try {
                 byte[] errorResponse = ErrorHandler.mapExceptionToResponse(e);
                 statusCode = ErrorHandler.getStatusCode(e);
-                clientSocket.getOutputStream().write(errorResponse);
+                if (clientOutput == null) {
+                    clientOutput = clientSocket.getOutputStream();
+                }
+                clientOutput.write(errorResponse);
+                clientOutput.flush();
                 responseBytes = errorResponse.length;
             } catch (IOException ioE) {
                 // Failed to send error response
@@ -161,7 +196,11 @@ public class ProxyServer {
             // Client timeout
             try {
                 byte[] errorResponse = ErrorResponseGenerator.gatewayTimeout("Request timeout");
-                clientSocket.getOutputStream().write(errorResponse);
+                if (clientOutput == null) {
+                    clientOutput = clientSocket.getOutputStream();
+                }
+                clientOutput.write(errorResponse);
+                clientOutput.flush();
                 statusCode = 504;
                 responseBytes = errorResponse.length;
             } catch (IOException ioE) {
@@ -169,10 +208,14 @@ public class ProxyServer {
             }
         } catch (Exception e) {
             // Error handling client request
-            e.printStackTrace();
+            logger.logError("Error handling client request", e);
             try {
                 byte[] errorResponse = ErrorResponseGenerator.badGateway("Internal proxy error");
-                clientSocket.getOutputStream().write(errorResponse);
+                if (clientOutput == null) {
+                    clientOutput = clientSocket.getOutputStream();
+                }
+                clientOutput.write(errorResponse);
+                clientOutput.flush();
                 statusCode = 502;
                 responseBytes = errorResponse.length;
             } catch (IOException ioE) {
@@ -200,7 +243,7 @@ public class ProxyServer {
             String path = urlParts[3];
             
             // Check for self-loop
-            if (URLParser.isSelfLoop(hostname, port, config.getPort())) {
+            if (URLParser.isSelfLoop(hostname, port, getBoundPort())) {
                 return ErrorResponseGenerator.misdirectedRequest("Self-loop detected");
             }
             
@@ -229,6 +272,15 @@ public class ProxyServer {
         }
     }
     
+    /**
+     * The port the server is actually listening on. With a configured port
+     * of 0 the kernel picks one at bind time, so callers (and the self-loop
+     * check) must consult this rather than the configuration.
+     */
+    public int getBoundPort() {
+        return boundPort != -1 ? boundPort : config.getPort();
+    }
+
     /**
      * Handle CONNECT method (placeholder - to be implemented in subclass).
      */
@@ -243,22 +295,29 @@ public class ProxyServer {
         if (responseData == null || responseData.length < 12) {
             return 502;
         }
-        
-        try {
-            String responseStr = new String(responseData, 0, Math.min(responseData.length, 100));
-            String[] lines = responseStr.split("\\r?\\n");
-            if (lines.length > 0) {
-                String statusLine = lines[0];
-                String[] parts = statusLine.split(" ");
-                if (parts.length >= 2) {
-                    return Integer.parseInt(parts[1]);
-                }
+
+        // The status code is the digit run after the first space of the
+        // status line ("HTTP/1.1 200 OK"); read it straight from the bytes
+        // instead of decoding and regex-splitting the response prefix
+        int i = 0;
+        int limit = Math.min(responseData.length, 100);
+        while (i < limit && responseData[i] != ' ') {
+            if (responseData[i] == '\r' || responseData[i] == '\n') {
+                return 502; // Status line ended before the code
             }
-        } catch (NumberFormatException e) {
-            // Ignore parsing errors
+            i++;
         }
-        
-        return 502;
+        i++; // Skip the space
+
+        int code = 0;
+        int digits = 0;
+        while (i < limit && responseData[i] >= '0' && responseData[i] <= '9') {
+            code = code * 10 + (responseData[i] - '0');
+            digits++;
+            i++;
+        }
+
+        return digits > 0 ? code : 502;
     }
     
     /**
@@ -268,22 +327,32 @@ public class ProxyServer {
         if (responseData == null) {
             return 0;
         }
-        
-        // Find end of headers
-        String responseStr = new String(responseData);
-        int headerEnd = responseStr.indexOf("\r\n\r\n");
+
+        int headerEnd = findHeaderEnd(responseData);
         if (headerEnd == -1) {
-            headerEnd = responseStr.indexOf("\n\n");
-            if (headerEnd == -1) {
-                return 0;
-            }
-            headerEnd += 2;
-        } else {
-            headerEnd += 4;
+            return 0;
         }
-        
+
         return Math.max(0, responseData.length - headerEnd);
     }
+
+    /**
+     * Find the index just past the end-of-headers marker (\r\n\r\n or \n\n),
+     * or -1 if the response has no complete header block. Scans the raw bytes
+     * directly so the full response is never decoded into a String.
+     */
+    protected int findHeaderEnd(byte[] responseData) {
+        for (int i = 0; i < responseData.length - 1; i++) {
+            if (responseData[i] == '\r' && i + 3 < responseData.length &&
+                responseData[i+1] == '\n' && responseData[i+2] == '\r' && responseData[i+3] == '\n') {
+                return i + 4;
+            }
+            if (responseData[i] == '\n' && responseData[i+1] == '\n') {
+                return i + 2;
+            }
+        }
+        return -1;
+    }
     
     /**
      * Safely close socket without throwing exceptions.
@@ -10,18 +10,22 @@ import java.util.Map;
  * Generates HTTP error responses.
  */
 public class ErrorResponseGenerator {
-    
+
+    // Built once; error generation sits on the request error path, so avoid
+    // rebuilding this table per response
+    private static final Map<Integer, String> REASON_PHRASES = new HashMap<>();
+    static {
+        REASON_PHRASES.put(400, "Bad Request");
+        REASON_PHRASES.put(421, "Misdirected Request");
+        REASON_PHRASES.put(502, "Bad Gateway");
+        REASON_PHRASES.put(504, "Gateway Timeout");
+    }
+
     /**
      * Generate an HTTP error response.
      */
     public static byte[] generateErrorResponse(int statusCode, String errorMessage, String contentType) {
-        Map<Integer, String> reasonPhrases = new HashMap<>();
-        reasonPhrases.put(400, "Bad Request");
-        reasonPhrases.put(421, "Misdirected Request");
-        reasonPhrases.put(502, "Bad Gateway");
-        reasonPhrases.put(504, "Gateway Timeout");
-        
-        String reasonPhrase = reasonPhrases.getOrDefault(statusCode, "Error");
+        String reasonPhrase = REASON_PHRASES.getOrDefault(statusCode, "Error");
         
         // Create simple error page
         String body = String.format("Error %d: %s\n\n%s", statusCode, reasonPhrase, errorMessage);
@@ -25,8 +25,9 @@ public class MessageTransformer {
      * Transform client request for forwarding to origin server.
      */
     public byte[] transformRequestForOrigin(HTTPRequest request, String hostname, int port, String path) {
-        // Build headers for forwarding
-        Map<String, String> headers = new LinkedHashMap<>();
+        // Build headers for forwarding; presize past the default 16 buckets
+        // since the copied headers plus our additions commonly exceed it
+        Map<String, String> headers = new LinkedHashMap<>(request.getRawHeaders().size() + 4);
         
         // Copy all headers except proxy-specific ones
         for (Map.Entry<String, String> entry : request.getRawHeaders().entrySet()) {
@@ -71,8 +72,8 @@ public class MessageTransformer {
      * Transform origin server response for forwarding to client with connection preference.
      */
     public byte[] transformResponseForClient(HTTPResponse response, HTTPRequest clientRequest) {
-        // Build headers for forwarding
-        Map<String, String> headers = new LinkedHashMap<>();
+        // Build headers for forwarding; presized as in transformRequestForOrigin
+        Map<String, String> headers = new LinkedHashMap<>(response.getRawHeaders().size() + 4);
         
         // Copy all headers except Connection (we'll set it based on client preference)
         for (Map.Entry<String, String> entry : response.getRawHeaders().entrySet()) {
@@ -14,6 +14,16 @@ import java.util.concurrent.atomic.AtomicReference;
  * Handles connections to origin servers.
  */
 public class OriginConnector {
+    // Shared pool for DNS lookups with a timeout. Daemon threads, created on
+    // demand and reclaimed when idle, replace the single-thread executor that
+    // was previously built and torn down on every resolution
+    private static final ExecutorService DNS_EXECUTOR =
+        Executors.newCachedThreadPool(runnable -> {
+            Thread thread = new Thread(runnable, "dns-resolver");
+            thread.setDaemon(true);
+            return thread;
+        });
+
     private final int timeout;
     
     public OriginConnector(int timeout) {
@@ -37,7 +47,10 @@ public class OriginConnector {
             
             Socket socket = new Socket();
             socket.setSoTimeout(timeout * 1000); // Convert to milliseconds
-            
+            // Requests and responses are forwarded as complete writes, so
+            // disable Nagle to avoid delaying small messages behind ACKs
+            socket.setTcpNoDelay(true);
+
             // Connect with resolved address
             InetSocketAddress socketAddress = new InetSocketAddress(address, port);
             socket.connect(socketAddress, timeout * 1000);
@@ -67,34 +80,29 @@ public class OriginConnector {
      * Resolve hostname with timeout.
      */
     private InetAddress resolveHostWithTimeout(String hostname, int timeoutSeconds) throws UnknownHostException {
-        ExecutorService executor = Executors.newSingleThreadExecutor();
-        try {
-            Future<InetAddress> future = executor.submit(() -> {
-                try {
-                    return InetAddress.getByName(hostname);
-                } catch (UnknownHostException e) {
-                    throw new RuntimeException(e);
-                }
-            });
-            
+        Future<InetAddress> future = DNS_EXECUTOR.submit(() -> {
             try {
-                return future.get(timeoutSeconds, TimeUnit.SECONDS);
-            } catch (TimeoutException e) {
-                future.cancel(true);
-                throw new UnknownHostException("DNS resolution timeout for: " + hostname);
-            } catch (ExecutionException e) {
-                Throwable cause = e.getCause();
-                if (cause instanceof RuntimeException && 
-                    cause.getCause() instanceof UnknownHostException) {
-                    throw (UnknownHostException) cause.getCause();
-                }
-                throw new UnknownHostException("Failed to resolve: " + hostname);
-            } catch (InterruptedException e) {
-                Thread.currentThread().interrupt();
-                throw new UnknownHostException("DNS resolution interrupted: " + hostname);
+                return InetAddress.getByName(hostname);
+            } catch (UnknownHostException e) {
+                throw new RuntimeException(e);
+            }
+        });
+        
+        try {
+            return future.get(timeoutSeconds, TimeUnit.SECONDS);
+        } catch (TimeoutException e) {
+            future.cancel(true);
+            throw new UnknownHostException("DNS resolution timeout for: " + hostname);
+        } catch (ExecutionException e) {
+            Throwable cause = e.getCause();
+            if (cause instanceof RuntimeException && 
+                cause.getCause() instanceof UnknownHostException) {
+                throw (UnknownHostException) cause.getCause();
             }
-        } finally {
-            executor.shutdownNow();
+            throw new UnknownHostException("Failed to resolve: " + hostname);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new UnknownHostException("DNS resolution interrupted: " + hostname);
         }
     }
 }
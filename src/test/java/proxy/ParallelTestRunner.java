@@ -0,0 +1,45 @@
+package proxy;
+
+import org.junit.experimental.ParallelComputer;
+import org.junit.runner.JUnitCore;
+import org.junit.runner.Result;
+import org.junit.runner.notification.Failure;
+
+/**
+ * Runs the pure unit test classes with one thread per class.
+ *
+ * These classes do not bind fixed ports or share mutable state, so there is
+ * no reason to run them back-to-back. The socket-heavy suites
+ * (ConcurrentProxyServerTest, ProxyIntegrationTest, ProxyStressTest) are
+ * deliberately excluded and should keep running serially via "make test".
+ */
+public class ParallelTestRunner {
+
+    private static final Class<?>[] UNIT_TEST_CLASSES = {
+        proxy.http.HTTPRequestTest.class,
+        proxy.http.HTTPResponseTest.class,
+        proxy.http.HTTPStreamReaderTest.class,
+        proxy.http.HTTPMessageBuilderTest.class,
+        proxy.config.ProxyConfigTest.class,
+        proxy.config.ProxyConfigNumberFormatTest.class,
+        proxy.cache.HTTPCacheTest.class,
+        proxy.utils.URLParserTest.class,
+        proxy.utils.ErrorHandlerTest.class,
+        proxy.utils.ErrorResponseGeneratorTest.class,
+        proxy.utils.MessageTransformerTest.class,
+        proxy.logging.ProxyLoggerTest.class,
+    };
+
+    public static void main(String[] args) {
+        Result result = JUnitCore.runClasses(ParallelComputer.classes(), UNIT_TEST_CLASSES);
+
+        System.out.println("Tests run: " + result.getRunCount() +
+                           ", failures: " + result.getFailureCount() +
+                           ", time: " + result.getRunTime() + "ms");
+        for (Failure failure : result.getFailures()) {
+            System.out.println(failure.toString());
+        }
+
+        System.exit(result.wasSuccessful() ? 0 : 1);
+    }
+}
@@ -1,7 +1,8 @@
 package proxy;
 
+import org.junit.AfterClass;
 import org.junit.Before;
-import org.junit.After;
+import org.junit.BeforeClass;
 import org.junit.Test;
 import static org.junit.Assert.*;
 
@@ -12,50 +13,62 @@ import proxy.cache.HTTPCache;
 import java.io.*;
 import java.net.Socket;
 import java.net.ServerSocket;
-import java.util.concurrent.CountDownLatch;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
 import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
 
 /**
  * Integration tests for the complete HTTP Proxy system.
  * Tests end-to-end functionality including all major features.
  */
 public class ProxyIntegrationTest {
-    private ProxyConfig config;
-    private ConcurrentProxyServer proxyServer;
-    private Thread proxyThread;
-    private int proxyPort;
+    // 64KB reader buffer so large responses drain in a handful of
+    // underlying reads instead of one per default-sized chunk
+    private static final int RESPONSE_BUFFER_SIZE = 65536;
+    
+    // One proxy/mock pair serves the whole class; per-test isolation is
+    // restored by clearing the cache (entries and counters) before each test
+    private static ProxyConfig config;
+    private static ConcurrentProxyServer proxyServer;
+    private static Thread proxyThread;
+    private static int proxyPort;
     
     // Mock HTTP server for testing
-    private ServerSocket mockServer;
-    private Thread mockServerThread;
-    private int mockServerPort;
+    private static ServerSocket mockServer;
+    private static Thread mockServerThread;
+    private static int mockServerPort;
     
-    @Before
-    public void setUp() throws IOException {
-        // Setup proxy
-        proxyPort = findAvailablePort();
-        config = new ProxyConfig(proxyPort, 10, 2048, 8192);
+    @BeforeClass
+    public static void setUpClass() throws IOException {
+        // Setup proxy on port 0: the kernel assigns the port at bind time,
+        // with no find-then-rebind window for another process to steal it
+        config = new ProxyConfig(0, 10, 2048, 8192);
         proxyServer = new ConcurrentProxyServer(config, 10);
         
         // Setup mock server
-        mockServerPort = findAvailablePort();
         setupMockHttpServer();
         
         // Start proxy
         startProxy();
-        
-        // Give servers time to start
-        try {
-            Thread.sleep(1000);
-        } catch (InterruptedException e) {
-            Thread.currentThread().interrupt();
-        }
+        proxyPort = TestSupport.waitForBoundPort(proxyServer, 5000);
+
+        // Wait until the proxy is actually accepting connections instead of
+        // sleeping a fixed second per test
+        TestSupport.waitForPort(proxyPort, proxyThread, 5000);
+    }
+
+    @Before
+    public void resetCache() {
+        proxyServer.clearCache();
     }
     
-    @After
-    public void tearDown() {
+    @AfterClass
+    public static void tearDownClass() {
         if (proxyServer != null) {
-            proxyServer.clearCache(); // Clear cache after each test
             proxyServer.shutdown();
         }
         if (proxyThread != null) {
@@ -77,27 +90,40 @@ public class ProxyIntegrationTest {
         }
     }
     
-    private int findAvailablePort() throws IOException {
-        try (ServerSocket socket = new ServerSocket(0)) {
-            return socket.getLocalPort();
+    /**
+     * Parse a Content-Length header line without lower-casing the whole line,
+     * returning -1 if the line is not a Content-Length header.
+     */
+    private static int parseContentLength(String line) {
+        if (!line.regionMatches(true, 0, "Content-Length:", 0, 15)) {
+            return -1;
+        }
+        try {
+            return Integer.parseInt(line.substring(15).trim());
+        } catch (NumberFormatException e) {
+            return -1;
         }
     }
-    
-    private void startProxy() {
+
+    private static void startProxy() {
         proxyThread = new Thread(() -> {
             try {
                 proxyServer.run();
             } catch (IOException e) {
                 if (!e.getMessage().contains("Socket closed")) {
-                    System.err.println("Proxy error: " + e.getMessage());
+                    System.out.println("Proxy error: " + e.getMessage());
                 }
             }
         });
         proxyThread.start();
     }
     
-    private void setupMockHttpServer() throws IOException {
-        mockServer = new ServerSocket(mockServerPort);
+    private static void setupMockHttpServer() throws IOException {
+        // Bind to an ephemeral port directly; probing for a free port and
+        // rebinding it separately leaves a window where another process can
+        // grab the port in between
+        mockServer = new ServerSocket(0);
+        mockServerPort = mockServer.getLocalPort();
         mockServerThread = new Thread(() -> {
             while (!Thread.currentThread().isInterrupted() && !mockServer.isClosed()) {
                 try {
@@ -105,7 +131,7 @@ public class ProxyIntegrationTest {
                     handleMockRequest(clientSocket);
                 } catch (IOException e) {
                     if (!e.getMessage().contains("Socket closed")) {
-                        System.err.println("Mock server error: " + e.getMessage());
+                        System.out.println("Mock server error: " + e.getMessage());
                     }
                     break;
                 }
@@ -114,8 +140,8 @@ public class ProxyIntegrationTest {
         mockServerThread.start();
     }
     
-    private void handleMockRequest(Socket clientSocket) {
-        try (BufferedReader in = new BufferedReader(new InputStreamReader(clientSocket.getInputStream()));
+    private static void handleMockRequest(Socket clientSocket) {
+        try (BufferedReader in = new BufferedReader(new InputStreamReader(clientSocket.getInputStream()), RESPONSE_BUFFER_SIZE);
              PrintWriter out = new PrintWriter(clientSocket.getOutputStream(), true)) {
             
             // Read request
@@ -127,24 +153,29 @@ public class ProxyIntegrationTest {
             boolean hasBody = false;
             int contentLength = 0;
             while ((line = in.readLine()) != null && !line.isEmpty()) {
-                if (line.toLowerCase().startsWith("content-length:")) {
-                    contentLength = Integer.parseInt(line.substring(15).trim());
+                int parsedLength = parseContentLength(line);
+                if (parsedLength >= 0) {
+                    contentLength = parsedLength;
                     hasBody = true;
                 }
             }
             
-            // Read body if present
-            StringBuilder body = new StringBuilder();
+            // Read body if present; loop until the declared length arrives
+            // rather than trusting one read() to return everything
+            String body = "";
             if (hasBody && contentLength > 0) {
                 char[] buffer = new char[contentLength];
-                int read = in.read(buffer, 0, contentLength);
-                if (read > 0) {
-                    body.append(new String(buffer, 0, read));
+                int totalRead = 0;
+                while (totalRead < contentLength) {
+                    int read = in.read(buffer, totalRead, contentLength - totalRead);
+                    if (read == -1) break;
+                    totalRead += read;
                 }
+                body = new String(buffer, 0, totalRead);
             }
             
             // Send appropriate response based on request
-            sendMockResponse(out, requestLine, body.toString());
+            sendMockResponse(out, requestLine, body);
             
         } catch (IOException e) {
             // Connection closed
@@ -157,95 +188,78 @@ public class ProxyIntegrationTest {
         }
     }
     
-    private void sendMockResponse(PrintWriter out, String requestLine, String body) {
+    // Mock responses are fixed per path, so assemble each one once instead
+    // of rebuilding the same string (and the 2500-char large body) per request
+    private static final String TEST_RESPONSE = buildMockResponse("200 OK", "Hello from mock server!");
+    private static final String LARGE_RESPONSE = buildLargeResponse();
+    private static final String CACHEABLE_RESPONSE = buildMockResponse("200 OK", "This response can be cached");
+    private static final String HEAD_RESPONSE = "HTTP/1.1 200 OK\r\n" +
+                                                "Content-Type: text/plain\r\n" +
+                                                "Content-Length: 25\r\n" +
+                                                "Connection: close\r\n" +
+                                                "\r\n";
+    private static final String NOT_FOUND_RESPONSE = buildMockResponse("404 Not Found", "Not Found");
+    private static final String DEFAULT_RESPONSE = buildMockResponse("200 OK", "Mock server default response");
+
+    private static String buildMockResponse(String status, String responseBody) {
+        return "HTTP/1.1 " + status + "\r\n" +
+               "Content-Type: text/plain\r\n" +
+               "Content-Length: " + responseBody.length() + "\r\n" +
+               "Connection: close\r\n" +
+               "\r\n" +
+               responseBody;
+    }
+
+    private static String buildLargeResponse() {
+        // Large response for cache testing - definitely larger than
+        // max_object_size (2048 bytes)
+        StringBuilder sb = new StringBuilder("Large response data: ");
+        for (int i = 0; i < 2500; i++) {
+            sb.append("X");
+        }
+        return buildMockResponse("200 OK", sb.toString());
+    }
+
+    private static void sendMockResponse(PrintWriter out, String requestLine, String body) {
+        String response;
+
         if (requestLine.contains("GET /test")) {
-            // Standard GET response
-            String responseBody = "Hello from mock server!";
-            out.println("HTTP/1.1 200 OK");
-            out.println("Content-Type: text/plain");
-            out.println("Content-Length: " + responseBody.length());
-            out.println("Connection: close");
-            out.println();
-            out.print(responseBody);
-            
+            response = TEST_RESPONSE;
         } else if (requestLine.contains("GET /large")) {
-            // Large response for cache testing - make it larger than max_object_size (2048)
-            StringBuilder sb = new StringBuilder("Large response data: ");
-            // Create a response body that's definitely larger than 2048 bytes
-            for (int i = 0; i < 2500; i++) {
-                sb.append("X");
-            }
-            String responseBody = sb.toString();
-            System.out.println("[MockServer] Large response size: " + responseBody.length() + " bytes");
-            out.println("HTTP/1.1 200 OK");
-            out.println("Content-Type: text/plain");
-            out.println("Content-Length: " + responseBody.length());
-            out.println("Connection: close");
-            out.println();
-            out.print(responseBody);
-            
+            response = LARGE_RESPONSE;
         } else if (requestLine.contains("GET /cacheable")) {
-            // Cacheable response
-            String responseBody = "This response can be cached";
-            out.println("HTTP/1.1 200 OK");
-            out.println("Content-Type: text/plain");
-            out.println("Content-Length: " + responseBody.length());
-            out.println("Connection: close");
-            out.println();
-            out.print(responseBody);
-            
+            response = CACHEABLE_RESPONSE;
         } else if (requestLine.contains("POST /api")) {
-            // POST response
-            String responseBody = "POST received: " + body;
-            out.println("HTTP/1.1 201 Created");
-            out.println("Content-Type: text/plain");
-            out.println("Content-Length: " + responseBody.length());
-            out.println("Connection: close");
-            out.println();
-            out.print(responseBody);
-            
+            // POST echoes the request body, so it can't be precomputed
+            response = buildMockResponse("201 Created", "POST received: " + body);
         } else if (requestLine.contains("HEAD /test")) {
-            // HEAD response (no body)
-            out.println("HTTP/1.1 200 OK");
-            out.println("Content-Type: text/plain");
-            out.println("Content-Length: 25");
-            out.println("Connection: close");
-            out.println();
-            
+            response = HEAD_RESPONSE; // No body
         } else if (requestLine.contains("GET /404")) {
-            // Error response
-            String responseBody = "Not Found";
-            out.println("HTTP/1.1 404 Not Found");
-            out.println("Content-Type: text/plain");
-            out.println("Content-Length: " + responseBody.length());
-            out.println("Connection: close");
-            out.println();
-            out.print(responseBody);
-            
+            response = NOT_FOUND_RESPONSE;
         } else {
-            // Default response
-            String responseBody = "Mock server default response";
-            out.println("HTTP/1.1 200 OK");
-            out.println("Content-Type: text/plain");
-            out.println("Content-Length: " + responseBody.length());
-            out.println("Connection: close");
-            out.println();
-            out.print(responseBody);
+            response = DEFAULT_RESPONSE;
         }
+
+        // Still one write/flush per response
+        out.print(response);
         out.flush();
     }
     
     @Test(timeout = 15000)
     public void testBasicGetRequest() throws Exception {
         try (Socket socket = new Socket("localhost", proxyPort)) {
+            // Disable Nagle so small test requests are not held back by
+            // delayed-ACK interaction on loopback
+            socket.setTcpNoDelay(true);
             PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
-            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()));
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
             
             // Send GET request through proxy
-            out.println("GET http://localhost:" + mockServerPort + "/test HTTP/1.1");
-            out.println("Host: localhost:" + mockServerPort);
-            out.println("Connection: close");
-            out.println();
+            out.print("GET http://localhost:" + mockServerPort + "/test HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
             
             // Read response
             String statusLine = in.readLine();
@@ -272,14 +286,16 @@ public class ProxyIntegrationTest {
     @Test(timeout = 15000)
     public void testHeadRequest() throws Exception {
         try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
             PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
-            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()));
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
             
             // Send HEAD request through proxy
-            out.println("HEAD http://localhost:" + mockServerPort + "/test HTTP/1.1");
-            out.println("Host: localhost:" + mockServerPort);
-            out.println("Connection: close");
-            out.println();
+            out.print("HEAD http://localhost:" + mockServerPort + "/test HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
             
             // Read response
             String statusLine = in.readLine();
@@ -290,7 +306,7 @@ public class ProxyIntegrationTest {
             boolean foundContentLength = false;
             String line;
             while ((line = in.readLine()) != null && !line.isEmpty()) {
-                if (line.toLowerCase().startsWith("content-length:")) {
+                if (parseContentLength(line) >= 0) {
                     foundContentLength = true;
                 }
             }
@@ -305,19 +321,21 @@ public class ProxyIntegrationTest {
     @Test(timeout = 15000)
     public void testPostRequest() throws Exception {
         try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
             PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
-            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()));
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
             
             String postData = "{\"test\": \"data\"}";
             
-            // Send POST request through proxy
-            out.println("POST http://localhost:" + mockServerPort + "/api HTTP/1.1");
-            out.println("Host: localhost:" + mockServerPort);
-            out.println("Content-Type: application/json");
-            out.println("Content-Length: " + postData.length());
-            out.println("Connection: close");
-            out.println();
-            out.print(postData);
+            // Send headers and body in one write so the request leaves as a
+            // single segment instead of headers and body separately
+            out.print("POST http://localhost:" + mockServerPort + "/api HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Content-Type: application/json\r\n" +
+                      "Content-Length: " + postData.length() + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n" +
+                      postData);
             out.flush();
             
             // Read response
@@ -336,17 +354,35 @@ public class ProxyIntegrationTest {
         assertEquals("Initial hits should be 0", 0, initialStats.hits);
         assertEquals("Initial misses should be 0", 0, initialStats.misses);
         
-        // First request - should be a cache miss
-        makeGetRequest("/cacheable");
-        
-        HTTPCache.CacheStats afterFirstRequest = proxyServer.getCacheStats();
-        assertEquals("Should have one cache miss", 1, afterFirstRequest.misses);
-        assertEquals("Should have one cache entry", 1, afterFirstRequest.entries);
-        assertEquals("Should have no cache hits yet", 0, afterFirstRequest.hits);
-        
-        // Second request - should be a cache hit
-        makeGetRequest("/cacheable");
-        
+        // Issue both requests over one keep-alive connection; opening a fresh
+        // socket per request would only measure connection setup, not caching
+        try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
+            PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
+
+            // First request - should be a cache miss
+            out.print("GET http://localhost:" + mockServerPort + "/cacheable HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: keep-alive\r\n" +
+                      "\r\n");
+            out.flush();
+            readFullResponse(in);
+
+            HTTPCache.CacheStats afterFirstRequest = proxyServer.getCacheStats();
+            assertEquals("Should have one cache miss", 1, afterFirstRequest.misses);
+            assertEquals("Should have one cache entry", 1, afterFirstRequest.entries);
+            assertEquals("Should have no cache hits yet", 0, afterFirstRequest.hits);
+
+            // Second request on the same connection - should be a cache hit
+            out.print("GET http://localhost:" + mockServerPort + "/cacheable HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
+            readFullResponse(in);
+        }
+
         HTTPCache.CacheStats afterSecondRequest = proxyServer.getCacheStats();
         assertTrue("Should have at least one cache hit", afterSecondRequest.hits >= 1);
         assertEquals("Should still have one cache miss", 1, afterSecondRequest.misses);
@@ -362,22 +398,22 @@ public class ProxyIntegrationTest {
         
         // Make request that exceeds max object size (2048 bytes)
         try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
             PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
-            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()));
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
             
-            out.println("GET http://localhost:" + mockServerPort + "/large HTTP/1.1");
-            out.println("Host: localhost:" + mockServerPort);
-            out.println("Connection: close");
-            out.println();
+            out.print("GET http://localhost:" + mockServerPort + "/large HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
             
             // Read full response
-            String response = readFullResponse(in, true);
-            System.out.println("[Test] Response received, length: " + response.length());
+            readFullResponse(in, true);
         }
         
         // Should not be cached due to size exceeding max_object_size (2048 bytes)
         HTTPCache.CacheStats finalStats = proxyServer.getCacheStats();
-        System.out.println("[Test] Final cache stats: " + finalStats);
         // Check that large responses don't increase cache size significantly
         assertTrue("Cache should not grow significantly from large responses", finalStats.entries <= 1);
         assertEquals("Should have one miss for the large request", 1, finalStats.misses);
@@ -387,23 +423,26 @@ public class ProxyIntegrationTest {
     @Test(timeout = 15000)
     public void testPersistentConnection() throws Exception {
         try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
             PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
-            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()));
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
             
             // First request with keep-alive
-            out.println("GET http://localhost:" + mockServerPort + "/test HTTP/1.1");
-            out.println("Host: localhost:" + mockServerPort);
-            out.println("Connection: keep-alive");
-            out.println();
+            out.print("GET http://localhost:" + mockServerPort + "/test HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: keep-alive\r\n" +
+                      "\r\n");
+            out.flush();
             
             // Read first response
             readFullResponse(in);
             
             // Second request on same connection
-            out.println("GET http://localhost:" + mockServerPort + "/test HTTP/1.1");
-            out.println("Host: localhost:" + mockServerPort);
-            out.println("Connection: close");
-            out.println();
+            out.print("GET http://localhost:" + mockServerPort + "/test HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
             
             // Read second response
             String statusLine = in.readLine();
@@ -412,17 +451,64 @@ public class ProxyIntegrationTest {
         }
     }
     
+    @Test(timeout = 15000)
+    public void testPipelinedRequests() throws Exception {
+        try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
+            PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
+
+            // Send all three requests in one batched write before reading
+            // any response (RFC 2616 8.1.1 pipelining)
+            out.print("GET http://localhost:" + mockServerPort + "/test HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: keep-alive\r\n" +
+                      "\r\n" +
+                      "GET http://localhost:" + mockServerPort + "/cacheable HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: keep-alive\r\n" +
+                      "\r\n" +
+                      "GET http://localhost:" + mockServerPort + "/test HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
+
+            // Responses must come back in order; readFullResponse frames each
+            // one by its Content-Length, leaving the stream positioned at the
+            // start of the next
+            String firstResponse = readFullResponse(in, true);
+            assertTrue("First pipelined response should be 200 OK", firstResponse.contains("200 OK"));
+            assertTrue("First pipelined response should have expected body",
+                      firstResponse.contains("Hello from mock server!"));
+
+            String secondResponse = readFullResponse(in, true);
+            assertTrue("Second pipelined response should be 200 OK", secondResponse.contains("200 OK"));
+            assertTrue("Second pipelined response should have expected body",
+                      secondResponse.contains("This response can be cached"));
+
+            String thirdResponse = readFullResponse(in, true);
+            assertTrue("Third pipelined response should be 200 OK", thirdResponse.contains("200 OK"));
+            assertTrue("Third pipelined response should have expected body",
+                      thirdResponse.contains("Hello from mock server!"));
+        }
+    }
+
     @Test(timeout = 15000)
     public void testErrorHandling() throws Exception {
         try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
             PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
-            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()));
-            
-            // Request to non-existent server
-            out.println("GET http://nonexistent.example.com/test HTTP/1.1");
-            out.println("Host: nonexistent.example.com");
-            out.println("Connection: close");
-            out.println();
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
+            
+            // Request to a non-existent server. The .invalid TLD is reserved
+            // (RFC 2606), so resolution fails without depending on what an
+            // upstream resolver does with unknown example.com subdomains
+            out.print("GET http://nonexistent.invalid/test HTTP/1.1\r\n" +
+                      "Host: nonexistent.invalid\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
             
             // Should get error response
             String statusLine = in.readLine();
@@ -435,41 +521,50 @@ public class ProxyIntegrationTest {
     @Test(timeout = 15000)
     public void testConcurrentRequests() throws Exception {
         int numRequests = 5;
-        CountDownLatch latch = new CountDownLatch(numRequests);
-        
+        int initialTotal = proxyServer.getConnectionStats().total;
+        AtomicInteger successCount = new AtomicInteger(0);
+        ExecutorService clientPool = Executors.newFixedThreadPool(numRequests);
+        List<Future<?>> requests = new ArrayList<>();
+
         for (int i = 0; i < numRequests; i++) {
             final int requestId = i;
-            Thread clientThread = new Thread(() -> {
+            requests.add(clientPool.submit(() -> {
                 try {
                     makeGetRequest("/test?id=" + requestId);
+                    successCount.incrementAndGet();
                 } catch (Exception e) {
-                    System.err.println("Concurrent request failed: " + e.getMessage());
-                } finally {
-                    latch.countDown();
+                    System.out.println("Concurrent request failed: " + e.getMessage());
                 }
-            });
-            clientThread.start();
+            }));
         }
-        
+
         // Wait for all requests to complete
-        assertTrue("All concurrent requests should complete", 
-                  latch.await(10, TimeUnit.SECONDS));
-        
-        // Verify connection stats
+        clientPool.shutdown();
+        for (Future<?> request : requests) {
+            request.get(10, TimeUnit.SECONDS);
+        }
+
+        // All five loopback requests should succeed, and the shared server's
+        // total should have grown by at least that many; the raw total also
+        // counts connections from earlier tests in this class
+        assertEquals("All concurrent requests should succeed", numRequests, successCount.get());
         ConcurrentProxyServer.ConnectionStats stats = proxyServer.getConnectionStats();
-        assertTrue("Should have handled multiple connections", stats.total >= numRequests);
+        assertTrue("Should have handled multiple connections",
+                  stats.total >= initialTotal + numRequests);
     }
     
     @Test(timeout = 15000)
     public void testViaHeaderHandling() throws Exception {
         try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
             PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
-            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()));
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
             
-            out.println("GET http://localhost:" + mockServerPort + "/test HTTP/1.1");
-            out.println("Host: localhost:" + mockServerPort);
-            out.println("Connection: close");
-            out.println();
+            out.print("GET http://localhost:" + mockServerPort + "/test HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
             
             // Read response headers
             String line;
@@ -488,13 +583,15 @@ public class ProxyIntegrationTest {
     
     private void makeGetRequest(String path) throws Exception {
         try (Socket socket = new Socket("localhost", proxyPort)) {
+            socket.setTcpNoDelay(true);
             PrintWriter out = new PrintWriter(socket.getOutputStream(), true);
-            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()));
+            BufferedReader in = new BufferedReader(new InputStreamReader(socket.getInputStream()), RESPONSE_BUFFER_SIZE);
             
-            out.println("GET http://localhost:" + mockServerPort + path + " HTTP/1.1");
-            out.println("Host: localhost:" + mockServerPort);
-            out.println("Connection: close");
-            out.println();
+            out.print("GET http://localhost:" + mockServerPort + path + " HTTP/1.1\r\n" +
+                      "Host: localhost:" + mockServerPort + "\r\n" +
+                      "Connection: close\r\n" +
+                      "\r\n");
+            out.flush();
             
             readFullResponse(in);
         }
@@ -518,11 +615,10 @@ public class ProxyIntegrationTest {
                 if (line.isEmpty()) {
                     inHeaders = false;
                     break;
-                } else if (line.toLowerCase().startsWith("content-length:")) {
-                    try {
-                        contentLength = Integer.parseInt(line.substring(15).trim());
-                    } catch (NumberFormatException e) {
-                        // Ignore
+                } else {
+                    int parsedLength = parseContentLength(line);
+                    if (parsedLength >= 0) {
+                        contentLength = parsedLength;
                     }
                 }
             }
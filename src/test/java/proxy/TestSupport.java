@@ -0,0 +1,75 @@
+package proxy;
+
+import proxy.server.ProxyServer;
+
+import java.io.IOException;
+import java.net.ServerSocket;
+import java.net.Socket;
+
+/**
+ * Static helpers shared by the socket-based test suites. Each suite
+ * previously carried its own copy of these.
+ */
+public final class TestSupport {
+
+    private TestSupport() {
+        // Static helpers only
+    }
+
+    /**
+     * An ephemeral port that was free at the time of the call. Only suitable
+     * for servers that are never started; started servers should bind port 0
+     * and report the kernel-assigned port instead.
+     */
+    public static int findAvailablePort() throws IOException {
+        try (ServerSocket socket = new ServerSocket(0)) {
+            return socket.getLocalPort();
+        }
+    }
+
+    /**
+     * Wait for a server started on port 0 to publish its kernel-assigned
+     * port after binding.
+     */
+    public static int waitForBoundPort(ProxyServer server, long timeoutMillis) throws IOException {
+        long deadline = System.currentTimeMillis() + timeoutMillis;
+        while (System.currentTimeMillis() < deadline) {
+            int port = server.getBoundPort();
+            if (port > 0) {
+                return port;
+            }
+            try {
+                Thread.sleep(10);
+            } catch (InterruptedException ie) {
+                Thread.currentThread().interrupt();
+                break;
+            }
+        }
+        throw new IOException("Proxy did not bind a port within " + timeoutMillis + "ms");
+    }
+
+    /**
+     * Block until the port accepts connections. If serverThread is non-null
+     * and dies first (e.g. bind failure), report that immediately instead of
+     * probing until the deadline.
+     */
+    public static void waitForPort(int port, Thread serverThread, long timeoutMillis) throws IOException {
+        long deadline = System.currentTimeMillis() + timeoutMillis;
+        while (System.currentTimeMillis() < deadline) {
+            if (serverThread != null && !serverThread.isAlive()) {
+                throw new IOException("Proxy thread exited before accepting connections");
+            }
+            try (Socket probe = new Socket("localhost", port)) {
+                return; // Port is accepting connections
+            } catch (IOException e) {
+                try {
+                    Thread.sleep(20);
+                } catch (InterruptedException ie) {
+                    Thread.currentThread().interrupt();
+                    break;
+                }
+            }
+        }
+        throw new IOException("Server on port " + port + " did not start within " + timeoutMillis + "ms");
+    }
+}
@@ -0,0 +1,51 @@
+package proxy.config;
+
+import org.junit.Test;
+import org.junit.runner.RunWith;
+import org.junit.runners.Parameterized;
+import org.junit.runners.Parameterized.Parameters;
+
+import java.util.Arrays;
+import java.util.Collection;
+
+import static org.junit.Assert.*;
+
+/**
+ * Parameterized tests for number format edge cases in ProxyConfig argument
+ * parsing. Each malformed input runs as its own test case, so a failure in
+ * one input is reported individually instead of aborting a shared loop.
+ */
+@RunWith(Parameterized.class)
+public class ProxyConfigNumberFormatTest {
+
+    @Parameters(name = "port=\"{0}\"")
+    public static Collection<Object[]> malformedPorts() {
+        return Arrays.asList(new Object[][] {
+            {"8080.0"}, // Float
+            {"8080L"},  // Long suffix
+            {" 8080 "}, // Whitespace
+            {"+8080"},  // Plus sign
+            {"0x1f90"}, // Hex
+            {"010000"}, // Octal-looking
+        });
+    }
+
+    private final String malformedPort;
+
+    public ProxyConfigNumberFormatTest(String malformedPort) {
+        this.malformedPort = malformedPort;
+    }
+
+    @Test
+    public void testMalformedPortRejected() {
+        try {
+            String[] args = {malformedPort, "30", "1024", "1048576"};
+            ProxyConfig.fromArgs(args);
+            fail("Should have thrown ConfigException for: " + malformedPort);
+        } catch (ConfigException e) {
+            // Expected - NumberFormatException should be caught and wrapped
+            assertTrue("Error message should mention invalid format",
+                      e.getMessage().contains("Invalid argument format"));
+        }
+    }
+}
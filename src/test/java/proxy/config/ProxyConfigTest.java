@@ -211,29 +211,4 @@ public class ProxyConfigTest {
         assertEquals(8080, config.getPort());
         assertEquals(30, config.getTimeout());
     }
-    
-    @Test
-    public void testNumberFormatEdgeCases() {
-        // Test various number format edge cases
-        String[] testCases = {
-            "8080.0", // Float
-            "8080L",  // Long suffix
-            " 8080 ", // Whitespace
-            "+8080",  // Plus sign
-            "0x1f90", // Hex
-            "010000", // Octal-looking
-        };
-        
-        for (String testCase : testCases) {
-            try {
-                String[] args = {testCase, "30", "1024", "1048576"};
-                ProxyConfig.fromArgs(args);
-                fail("Should have thrown ConfigException for: " + testCase);
-            } catch (ConfigException e) {
-                // Expected - NumberFormatException should be caught and wrapped
-                assertTrue("Error message should mention invalid format", 
-                          e.getMessage().contains("Invalid argument format"));
-            }
-        }
-    }
 }
\ No newline at end of file
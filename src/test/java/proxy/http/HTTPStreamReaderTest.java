@@ -120,8 +120,14 @@ public class HTTPStreamReaderTest {
             Thread serverThread = new Thread(() -> {
                 try {
                     Socket clientSocket = serverSocket.accept();
-                    // Don't send any data - should cause timeout
-                    Thread.sleep(10000);
+                    // Don't send any data - should cause timeout. Hold the
+                    // connection by blocking on read, which returns as soon
+                    // as the client side closes, instead of pinning the
+                    // thread for a fixed ten seconds
+                    InputStream hold = clientSocket.getInputStream();
+                    while (hold.read() != -1) {
+                        // Discard
+                    }
                     clientSocket.close();
                 } catch (Exception e) {
                     // Expected for timeout test
@@ -129,9 +135,10 @@ public class HTTPStreamReaderTest {
             });
             serverThread.start();
             
-            Socket socket = new Socket("localhost", serverSocket.getLocalPort());
-            HTTPStreamReader reader = new HTTPStreamReader(socket, 1); // 1 second timeout
-            reader.readHttpRequest(); // Should timeout
+            try (Socket socket = new Socket("localhost", serverSocket.getLocalPort())) {
+                HTTPStreamReader reader = new HTTPStreamReader(socket, 1); // 1 second timeout
+                reader.readHttpRequest(); // Should timeout
+            }
         }
     }
     
@@ -253,13 +260,23 @@ public class HTTPStreamReaderTest {
             serverThread = new Thread(() -> {
                 try (Socket serverSideSocket = serverSocket.accept();
                      OutputStream out = serverSideSocket.getOutputStream()) {
-                    
+
                     out.write(data.getBytes());
                     out.flush();
-                    
-                    // Keep connection open briefly
-                    Thread.sleep(100);
-                    
+
+                    // Signal end-of-stream right away instead of holding the
+                    // connection open with a fixed sleep; close-delimited
+                    // reads see EOF immediately rather than after a timeout
+                    serverSideSocket.shutdownOutput();
+
+                    // Hold the socket until the client side is done with it,
+                    // draining in chunks rather than one syscall per byte
+                    InputStream in = serverSideSocket.getInputStream();
+                    byte[] drain = new byte[1024];
+                    while (in.read(drain) != -1) {
+                        // Discard until the client closes
+                    }
+
                 } catch (Exception e) {
                     // Expected for test scenarios
                 }